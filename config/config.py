@@ -1,20 +1,115 @@
+import functools
+import hashlib
+import json
+import logging
 import os
+import pickle
 import sys
 from pathlib import Path
 
 import yaml
-from pydantic import BaseModel, Field
-from pydantic.networks import AnyHttpUrl
-from typing_extensions import Annotated
+import pydantic
+from pydantic import BaseModel, Field, StringConstraints
+from typing_extensions import Annotated, Final, Literal
+
+# ✅ Prefer the libyaml-backed loader, fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+# ✅ Resolve the default settings location once (`config/` lives directly under the project root)
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_DEFAULT_SETTINGS_FILE = (_PROJECT_ROOT / "config" / "settings.yaml").resolve()
 
 # ✅ Store configuration errors for later logging
 CONFIG_ERRORS = []
 
+# ✅ Shared log level type (validated by set membership instead of a regex per field)
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+# ✅ Lightweight HTTP(S) URL check (plain string, no URL object or normalization)
+HttpUrlStr = Annotated[str, StringConstraints(strip_whitespace=True, pattern=r"^https?://[^\s/$.?#].[^\s]*$")]
+
+# ✅ Database URL default, read from the environment once at import
+_DEFAULT_DB_URL: Final[str] = os.environ.get("HEALTH_DB_URL", "").strip() or "https://localhost:5432/health_db"
+
+# ✅ Legacy environment variable names accepted alongside `<env_prefix><FIELD>`
+_ENV_ALIASES: Final[dict] = {"HEALTH_DATABASE_URL": "HEALTH_DB_URL"}
+
+# ✅ Defaults merged into the `logging` section of settings.yaml
+_LOGGING_DEFAULTS: Final[dict] = {
+    "log_level": "INFO",
+    "file_log_level": "DEBUG",
+    "console_log_level": "WARNING",
+    "log_file_path": "logs/health_service.log",
+    "error_log_file_path": "logs/error.log",
+    "log_queue_size": 10000,
+    "max_log_file_size": 5000000,
+    "max_backup_files": 5,
+    "enable_memory_logging": True,
+    "enable_execution_time_logging": True,
+    "enable_request_metadata": True,
+    "enable_stack_trace_logging": True,
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_yaml(path, mtime_ns):
+    """
+    Parses a YAML settings file, cached per (path, mtime) so unchanged files are read once.
+
+    Returns:
+        dict: Parsed settings (shared between callers, must not be mutated).
+    """
+    return yaml.load(Path(path).read_bytes(), Loader=_YamlLoader) or {}  # ✅ Ensure settings is a dictionary
+
+
+@functools.lru_cache(maxsize=None)
+def _json_schema(model):
+    """Builds the JSON schema for a model class once; the result is shared and must not be mutated."""
+    return model.model_json_schema()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version():
+    """
+    Fingerprints the code that validates settings: pydantic version, `Config` schema and this module's source.
+
+    Returns:
+        str: Hex digest that changes whenever a snapshot built by older code must not be reused.
+    """
+    digest = hashlib.sha256(pydantic.VERSION.encode())
+    digest.update(json.dumps(_json_schema(Config), sort_keys=True).encode())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def _freeze(value):
+    """Recursively converts dicts and lists into hashable frozensets and tuples."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Reverses `_freeze()`, rebuilding the original dicts and lists."""
+    if isinstance(value, frozenset):
+        return {key: _thaw(item) for key, item in value}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
 class LoggingConfig(BaseModel):
     """Logging settings validation with environment variable support."""
-    log_level: Annotated[str, Field(pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")]
-    file_log_level: Annotated[str, Field(pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")]
-    console_log_level: Annotated[str, Field(pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")]
+    log_level: LogLevel
+    file_log_level: LogLevel
+    console_log_level: LogLevel
     log_file_path: str
     error_log_file_path: str
     log_queue_size: int = Field(..., gt=0)
@@ -26,7 +121,7 @@ class LoggingConfig(BaseModel):
     enable_request_metadata: bool
     enable_stack_trace_logging: bool
 
-    model_config = {"env_prefix": "HEALTH_LOGGING_"}  # ✅ Environment Variable Support
+    model_config = {"env_prefix": "HEALTH_LOGGING_", "extra": "forbid", "frozen": True, "validate_assignment": False}  # ✅ Environment Variable Support
 
 class HealthConfig(BaseModel):
     """Health check settings validation with environment variable support."""
@@ -36,34 +131,35 @@ class HealthConfig(BaseModel):
     enable_cache_check: bool
     enable_messaging_check: bool
 
-    model_config = {"env_prefix": "HEALTH_"}  # ✅ Environment Variable Support
+    model_config = {"env_prefix": "HEALTH_", "extra": "forbid", "frozen": True, "validate_assignment": False}  # ✅ Environment Variable Support
 
 class DatabaseConfig(BaseModel):
     """Database settings validation with environment variable support."""
-    url: AnyHttpUrl = Field(default_factory=lambda: os.getenv("HEALTH_DB_URL") or "https://localhost:5432/health_db")
+    url: HttpUrlStr = Field(default=_DEFAULT_DB_URL)
 
-    model_config = {"env_prefix": "HEALTH_DATABASE_"}  # ✅ Ensure pydantic allows env var overrides
+    model_config = {"env_prefix": "HEALTH_DATABASE_", "extra": "forbid", "frozen": True, "validate_assignment": False}  # ✅ Ensure pydantic allows env var overrides
 
-class CacheConfig(BaseModel):
-    """Cache settings validation."""
+class _HostPortConfig(BaseModel):
+    """Shared host/port validation for network service sections."""
     host: Annotated[str, Field(min_length=3, max_length=255)]  # ✅ Enforce hostname length
     port: int = Field(..., ge=1, le=65535)
 
+    model_config = {"extra": "forbid", "frozen": True, "validate_assignment": False}
+
+class CacheConfig(_HostPortConfig):
+    """Cache settings validation."""
     model_config = {"env_prefix": "HEALTH_CACHE_"}  # ✅ Environment Variable Support
 
-class MessagingConfig(BaseModel):
+class MessagingConfig(_HostPortConfig):
     """Messaging settings validation."""
-    host: Annotated[str, Field(min_length=3, max_length=255)]  # ✅ Validate hostname length
-    port: int = Field(..., ge=1, le=65535)
-
     model_config = {"env_prefix": "HEALTH_MESSAGING_"}  # ✅ Environment Variable Support
 
 class AlertConfig(BaseModel):
     """Alerting settings validation."""
-    slack_webhook: AnyHttpUrl
+    slack_webhook: HttpUrlStr
     failure_threshold: int = Field(..., ge=1)
 
-    model_config = {"env_prefix": "HEALTH_ALERT_"}  # ✅ Environment Variable Support
+    model_config = {"env_prefix": "HEALTH_ALERT_", "extra": "forbid", "frozen": True, "validate_assignment": False}  # ✅ Environment Variable Support
 
 class Config(BaseModel):
     """
@@ -82,13 +178,18 @@ class Config(BaseModel):
     messaging: MessagingConfig
     alerts: AlertConfig
 
-    model_config = {"frozen": True}  # ✅ Enforce immutability
+    # ✅ Enforce immutability and compile the validator at class creation. Unknown top-level
+    # keys are ignored because settings.yaml also carries flat `LOG_LEVEL`-style entries.
+    model_config = {"frozen": True, "validate_assignment": False, "defer_build": False}
 
     @classmethod
-    def load(cls, settings_file="config/settings.yaml"):
+    def load(cls, settings_file=None):
         """
         Loads settings from YAML file and validates them using `pydantic`.
 
+        Parsed YAML is cached per (path, mtime) and validated configs per settings
+        payload, so repeated calls are cheap. Use `Config.load.cache_clear()` to reset.
+
         Returns:
             Config: Validated configuration instance.
 
@@ -98,55 +199,26 @@ class Config(BaseModel):
             ValueError: If the configuration file is empty.
             ValidationError: If the configuration is invalid.
         """
-        # ✅ Ensure settings.yaml is loaded from the correct `config/` directory
-        project_root = Path(__file__).resolve().parent.parent  # ✅ Move up from `config/` to project root
-        config_dir = project_root / "config"
-        default_settings_file = config_dir / "settings.yaml"
-
-        # ✅ Override with TEST_CONFIG_PATH if explicitly set, else use default
-        settings_file = os.getenv("TEST_CONFIG_PATH")
-        if settings_file:
-            settings_file = Path(settings_file).resolve()
-        else:
-            settings_file = default_settings_file.resolve()
-
-        # ✅ Print debugging information
-        print(f"🔍 Debugging Path Resolution in `Config.load()`:")
-        print(f"📌 `__file__`: {__file__}")
-        print(f"📌 `project_root`: {project_root}")
-        print(f"📌 `config_dir`: {config_dir}")
-        print(f"📌 `default_settings_file`: {default_settings_file}")
-        print(f"📌 `settings_file` (Final Selected Path): {settings_file}")  # ✅ Should now be correct
+        settings_file = cls._resolve_path(settings_file)
 
         try:
-            with open(settings_file, "r") as file:
-                settings = yaml.safe_load(file) or {}  # ✅ Ensure settings is a dictionary
-                print(f"settings: {settings}")
+            raw_settings = _read_yaml(settings_file, settings_file.stat().st_mtime_ns)
 
             # ✅ Validate that the file is not empty
-            if not settings:
+            if not raw_settings:
                 raise ValueError("Configuration file is empty or invalid.")
 
-            # ✅ Ensure logging settings exist
-            settings.setdefault("logging", {})
-            logging_defaults = {
-                "log_level": "INFO",
-                "file_log_level": "DEBUG",
-                "console_log_level": "WARNING",
-                "log_file_path": "logs/health_service.log",
-                "error_log_file_path": "logs/error.log",
-                "log_queue_size": 10000,
-                "max_log_file_size": 5000000,
-                "max_backup_files": 5,
-                "enable_memory_logging": True,
-                "enable_execution_time_logging": True,
-                "enable_request_metadata": True,
-                "enable_stack_trace_logging": True,
-            }
-            for key, value in logging_defaults.items():
-                settings["logging"].setdefault(key, value)
-
-            return cls(**settings)  # ✅ Let `pydantic` raise ValidationError if needed
+            # ✅ Copy sections so the cached YAML payload is never mutated
+            settings = {key: dict(value) if isinstance(value, dict) else value for key, value in raw_settings.items()}
+
+            # ✅ Fill in logging defaults (a missing `logging` section is still reported by `pydantic`)
+            if "logging" in settings:
+                settings["logging"] = _LOGGING_DEFAULTS | (settings["logging"] or {})
+
+            # ✅ Environment variables take precedence over YAML values
+            cls._apply_env_overrides(settings)
+
+            return cls._build(_freeze(settings))  # ✅ Let `pydantic` raise ValidationError if needed
         except FileNotFoundError:
             error_msg = f"❌ Configuration file `{settings_file}` not found."
             print(error_msg, file=sys.stderr)
@@ -163,22 +235,153 @@ class Config(BaseModel):
             CONFIG_ERRORS.append(error_msg)
             raise
 
+    @classmethod
+    def _apply_env_overrides(cls, settings):
+        """
+        Applies `<env_prefix><FIELD>` environment variables (e.g. `HEALTH_CACHE_PORT`) in place.
+
+        Only sections present in `settings` are updated, and empty values are ignored so the
+        YAML value is kept. `HEALTH_DB_URL` is accepted as an alias of `HEALTH_DATABASE_URL`.
+
+        Args:
+            settings (dict): Parsed settings whose section dicts may be modified.
+        """
+        for section, field_info in cls.model_fields.items():
+            section_settings = settings.get(section)
+            prefix = field_info.annotation.model_config.get("env_prefix")
+            if not isinstance(section_settings, dict) or not prefix:
+                continue
+
+            for name in field_info.annotation.model_fields:
+                env_name = f"{prefix}{name.upper()}"
+                value = os.environ.get(env_name, "").strip() or os.environ.get(_ENV_ALIASES.get(env_name, ""), "").strip()
+                if value:
+                    section_settings[name] = value
+
+    @classmethod
+    def load_cached(cls, settings_file=None, cache_path=None):
+        """
+        Loads settings from a pickled snapshot when it was built from the same inputs.
+
+        Opt-in fast path for production boots that skips YAML parsing and validation. It is
+        enabled by `cache_path` or `HEALTH_CONFIG_CACHE_PATH`; without either it behaves
+        exactly like `load()`. The snapshot records the settings path, its `st_mtime_ns`, the
+        `HEALTH_*` environment and the config code version it was built with, and is rebuilt via
+        `load()` if any of them differ or it cannot be read.
+        The snapshot is trusted, so it must only be writable by the service.
+
+        Returns:
+            Config: Validated (or previously validated) configuration instance.
+        """
+        cache_path = cache_path or os.getenv("HEALTH_CONFIG_CACHE_PATH")
+        if not cache_path:
+            return cls.load(settings_file)
+
+        cache_path = Path(cache_path)
+        settings_file = cls._resolve_path(settings_file)
+
+        # ✅ Reuse the snapshot only if it was built from this file, at this version, with this environment
+        try:
+            snapshot_key = cls._snapshot_key(settings_file)
+            cached_key, cached_config = pickle.loads(cache_path.read_bytes())
+            if cached_key == snapshot_key:
+                return cached_config
+        except Exception as e:  # ✅ Best-effort cache: any unreadable snapshot (e.g. a renamed module) means a rebuild
+            logger.debug("Config snapshot `%s` not usable, validating YAML instead: %s", cache_path, e)
+
+        config = cls.load(settings_file)
+
+        # ✅ Refresh the snapshot atomically; a failed write must not block startup
+        try:
+            tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+            tmp_path.write_bytes(pickle.dumps((cls._snapshot_key(settings_file), config)))
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning("Could not write config snapshot `%s`: %s", cache_path, e)
+
+        return config
+
+    @staticmethod
+    def _snapshot_key(settings_file):
+        """
+        Identifies the inputs of a `load()` call: settings path, its mtime, the `HEALTH_*` environment
+        and the version of the validating code (`_code_version()`).
+
+        Args:
+            settings_file (Path): Resolved settings file.
+
+        Returns:
+            tuple: Hashable key compared against the one stored in a snapshot.
+        """
+        environment = tuple(sorted(
+            (name, value) for name, value in os.environ.items()
+            if name.startswith("HEALTH_") and not name.startswith("HEALTH_CONFIG_")
+        ))
+        return str(settings_file), settings_file.stat().st_mtime_ns, environment, _code_version()
+
+    @staticmethod
+    def _resolve_path(settings_file=None):
+        """
+        Resolves the settings file: explicit argument, then `TEST_CONFIG_PATH`, then `config/settings.yaml`.
+
+        Returns:
+            Path: Absolute path of the settings file to load.
+        """
+        # ✅ Override with TEST_CONFIG_PATH if explicitly set, else use default
+        settings_file = settings_file or os.getenv("TEST_CONFIG_PATH")
+        settings_file = Path(settings_file).resolve() if settings_file else _DEFAULT_SETTINGS_FILE
+
+        # ✅ Debug path resolution only when explicitly requested
+        if os.getenv("HEALTH_CONFIG_DEBUG"):
+            logger.debug("Config path resolution: file=%s root=%s final=%s", __file__, _PROJECT_ROOT, settings_file)
+
+        return settings_file
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _build(cls, frozen_settings):
+        """
+        Validates a frozen settings payload, caching the resulting `Config`.
+
+        Args:
+            frozen_settings (frozenset): Settings normalized by `_freeze()`.
+
+        Returns:
+            Config: Validated configuration instance.
+        """
+        return cls(**_thaw(frozen_settings))
+
     @classmethod
     def generate_schema(cls):
         """
         Generates a JSON Schema from the pydantic model.
 
+        The schema is built once per class and cached, so callers must treat it as read-only.
+
         Returns:
             dict: JSON Schema representation of the configuration.
         """
-        return cls.model_json_schema()
+        return _json_schema(cls)
+
+
+def _clear_load_caches():
+    """Clears the YAML and validation caches used by `Config.load()`."""
+    _read_yaml.cache_clear()
+    Config._build.cache_clear()
+
+
+# ✅ Expose cache invalidation as `Config.load.cache_clear()`
+Config.load.__func__.cache_clear = _clear_load_caches
+
 
 def load_config():
     """
     Returns an instance of the validated `Config` class.
 
+    Uses the pickled snapshot fast path when `HEALTH_CONFIG_CACHE_PATH` is set.
+
     Usage:
         config = load_config()
         print(config.database.url)
     """
-    return Config.load()
+    return Config.load_cached()
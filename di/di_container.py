@@ -1,7 +1,21 @@
+import functools
+
 from dependency_injector import containers, providers
 from config.config import load_config
 from utils.logging_config import configure_logging
 
+
+@functools.cache
+def _cached_config():
+    """
+    Returns the process-wide `Config`, built on first use.
+
+    Unlike a per-container `providers.Singleton`, this survives new `Container()` instances
+    and `reset_singletons()`. Call `_cached_config.cache_clear()` to force a reload.
+    """
+    return load_config()
+
+
 class Container(containers.DeclarativeContainer):
     """
     Dependency Injection container for the Health Microservice.
@@ -11,7 +25,7 @@ class Container(containers.DeclarativeContainer):
     """
 
     # ✅ Load configuration
-    config = providers.Singleton(load_config)
+    config = providers.Singleton(_cached_config)
 
     # ✅ Initialize structured logging
     logging = providers.Singleton(configure_logging)
@@ -1,9 +1,17 @@
 import os
+import re
+from unittest.mock import patch
+
 import pytest
 import yaml
 from pydantic import ValidationError
 from config.config import Config, CONFIG_ERRORS
 
+# ✅ Prefer the libyaml-backed dumper when available
+try:
+    from yaml import CDumper as _Dumper
+except ImportError:
+    from yaml import Dumper as _Dumper
 
 # ✅ Centralized test data
 VALID_CONFIG = {
@@ -34,61 +42,144 @@ VALID_CONFIG = {
     "alerts": {"slack_webhook": "https://hooks.slack.com/services/T00000000/B00000000/XXXXXXXXXXXX", "failure_threshold": 3},
 }
 
+# ✅ Each invalid payload is built lazily, only when its test case runs
 INVALID_CONFIGS = {
     "missing_logging": {
         "error_match": "logging\n  Field required",
-        "config": {k: v for k, v in VALID_CONFIG.items() if k != "logging"},
+        "config": lambda: {k: v for k, v in VALID_CONFIG.items() if k != "logging"},
     },
     "invalid_log_level": {
-        "error_match": "String should match pattern",
-        "config": {**VALID_CONFIG, "logging": {**VALID_CONFIG["logging"], "log_level": "INVALID"}},
+        "error_match": "Input should be 'DEBUG', 'INFO', 'WARNING', 'ERROR' or 'CRITICAL'",
+        "config": lambda: {**VALID_CONFIG, "logging": {**VALID_CONFIG["logging"], "log_level": "INVALID"}},
     },
     "invalid_port": {
         "error_match": "should be less than or equal to 65535",
-        "config": {**VALID_CONFIG, "cache": {"host": "cache.example.com", "port": 999999}},
+        "config": lambda: {**VALID_CONFIG, "cache": {"host": "cache.example.com", "port": 999999}},
     },
     "invalid_url": {
-        "error_match": "valid URL",
-        "config": {**VALID_CONFIG, "database": {"url": "not_a_valid_url"}},
+        "error_match": "String should match pattern",
+        "config": lambda: {**VALID_CONFIG, "database": {"url": "not_a_valid_url"}},
     },
     "negative_values": {
         "error_match": "should be greater than or equal to 1",
-        "config": {**VALID_CONFIG, "health": {**VALID_CONFIG["health"], "retry_count": -1}},
+        "config": lambda: {**VALID_CONFIG, "health": {**VALID_CONFIG["health"], "retry_count": -1}},
     },
     "invalid_hostname": {
         "error_match": "String should have at least 3 characters",
-        "config": {**VALID_CONFIG, "cache": {"host": "x", "port": 6379}},
+        "config": lambda: {**VALID_CONFIG, "cache": {"host": "x", "port": 6379}},
     },
 }
 
+# ✅ Compile each expected error pattern once
+_COMPILED_MATCHES = {case: re.compile(data["error_match"]) for case, data in INVALID_CONFIGS.items()}
+
 @pytest.fixture(autouse=True)
 def clear_config_errors():
-    """Ensures CONFIG_ERRORS is cleared before each test."""
+    """Ensures CONFIG_ERRORS and the `Config.load()` caches are cleared before each test."""
     CONFIG_ERRORS.clear()
+    Config.load.cache_clear()
+
+@pytest.fixture(scope="session")
+def write_config_file(tmp_path_factory):
+    """Writes each distinct config payload to a YAML file once per session, keyed by identity."""
+    written = {}
+
+    def _write(payload):
+        if id(payload) not in written:
+            config_file = tmp_path_factory.mktemp("config") / "settings.yaml"
+            with open(config_file, "w") as f:
+                yaml.dump(payload, f, Dumper=_Dumper)
+            written[id(payload)] = (payload, str(config_file))  # ✅ Keep payload alive so its id is never reused
+        return written[id(payload)][1]
+
+    return _write
 
 @pytest.fixture
-def mock_config_file(tmp_path, request):
-    """Creates a temporary YAML file with the requested config data."""
-    config_file = tmp_path / "settings.yaml"
-    with open(config_file, "w") as f:
-        yaml.dump(request.param, f)
-    return str(config_file)
+def mock_config_file(write_config_file, request):
+    """Returns a YAML file with the requested config data, shared by tests using the same payload."""
+    return write_config_file(request.param)
 
 @pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
 def test_load_valid_config(mock_config_file):
     """✅ Test that valid configurations load correctly."""
     config = Config.load(mock_config_file)
     assert config.logging.log_level == "INFO"
-    assert str(config.database.url) == "https://localhost:5432/health_db"
+    assert config.database.url == "https://localhost:5432/health_db"
+
+@pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
+def test_load_is_cached(mock_config_file):
+    """✅ Test that repeated loads of an unchanged file reuse the validated config."""
+    config = Config.load(mock_config_file)
+    assert Config.load(mock_config_file) is config
+
+    Config.load.cache_clear()
+    reloaded = Config.load(mock_config_file)
+    assert reloaded is not config
+    assert reloaded == config
+
+@pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
+def test_cached_config_sections_are_frozen(mock_config_file):
+    """❌ Test that the shared cached config cannot be modified through its sections."""
+    config = Config.load(mock_config_file)
+    with pytest.raises(ValidationError, match="Instance is frozen"):
+        config.cache.port = 1
+
+    assert Config.load(mock_config_file).cache.port == config.cache.port
+
+@pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
+def test_load_cached_snapshot(monkeypatch, mock_config_file, tmp_path):
+    """✅ Test that `load_cached` writes a snapshot and reuses it without revalidating."""
+    cache_path = tmp_path / "config.pkl"
+    monkeypatch.setenv("HEALTH_CONFIG_CACHE_PATH", str(cache_path))
+
+    config = Config.load_cached(mock_config_file)
+    assert cache_path.exists()
+
+    with patch.object(Config, "load", side_effect=AssertionError("snapshot not used")):
+        cached = Config.load_cached(mock_config_file)
+    assert cached == config
+
+@pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
+def test_load_cached_snapshot_invalidated(monkeypatch, mock_config_file, tmp_path):
+    """✅ Test that a snapshot is not reused for another settings file or changed environment."""
+    other_file = tmp_path / "other.yaml"
+    other_settings = {**VALID_CONFIG, "cache": {**VALID_CONFIG["cache"], "host": "cache.internal"}}
+    other_file.write_text(yaml.dump(other_settings, Dumper=_Dumper))
+
+    # ✅ The snapshot is newer than both settings files
+    monkeypatch.setenv("HEALTH_CONFIG_CACHE_PATH", str(tmp_path / "config.pkl"))
+    Config.load_cached(mock_config_file)
+
+    assert Config.load_cached(str(other_file)).cache.host == "cache.internal"
+
+    monkeypatch.setenv("HEALTH_CACHE_PORT", "7000")
+    assert Config.load_cached(str(other_file)).cache.port == 7000
+
+@pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
+def test_load_cached_snapshot_rebuilt_when_unusable(monkeypatch, mock_config_file, tmp_path):
+    """✅ Test that a snapshot from other code, or one that cannot be unpickled, falls back to `load()`."""
+    cache_path = tmp_path / "config.pkl"
+    monkeypatch.setenv("HEALTH_CONFIG_CACHE_PATH", str(cache_path))
+    config = Config.load_cached(mock_config_file)
+
+    # ✅ Simulate a deploy that changed the config models
+    with patch("config.config._code_version", return_value="other-code"):
+        with patch.object(Config, "load", return_value=config) as mock_load:
+            Config.load_cached(mock_config_file)
+    mock_load.assert_called_once()
+
+    # ✅ A snapshot referencing a module that no longer exists
+    cache_path.write_bytes(b"cno_such_module\nThing\n.")
+    assert Config.load_cached(mock_config_file) == config
 
 @pytest.mark.parametrize("invalid_case", INVALID_CONFIGS.keys())
 def test_invalid_configs(invalid_case, tmp_path):
     """❌ Test multiple invalid configurations with specific error matching."""
     config_file = tmp_path / "settings.yaml"
     with open(config_file, "w") as f:
-        yaml.dump(INVALID_CONFIGS[invalid_case]["config"], f)
+        yaml.dump(INVALID_CONFIGS[invalid_case]["config"](), f, Dumper=_Dumper)
 
-    with pytest.raises(ValidationError, match=INVALID_CONFIGS[invalid_case]["error_match"]):
+    with pytest.raises(ValidationError, match=_COMPILED_MATCHES[invalid_case]):
         Config.load(str(config_file))
 
 @pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
@@ -96,14 +187,14 @@ def test_env_variable_override(monkeypatch, mock_config_file):
     """✅ Test valid environment variable overrides."""
     monkeypatch.setenv("HEALTH_DB_URL", "https://override.example.com")
     config = Config.load(mock_config_file)
-    assert str(config.database.url) == "https://override.example.com/"
+    assert config.database.url == "https://override.example.com"
 
 @pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
 def test_env_variable_empty_value(monkeypatch, mock_config_file):
     """✅ Test that an empty environment variable falls back to YAML value."""
     monkeypatch.setenv("HEALTH_DB_URL", "")
     config = Config.load(mock_config_file)
-    assert str(config.database.url) == "https://localhost:5432/health_db"
+    assert config.database.url == "https://localhost:5432/health_db"
 
 def test_invalid_yaml(tmp_path):
     """❌ Test that an invalid YAML file raises a `yaml.YAMLError`."""
@@ -125,7 +216,7 @@ def test_env_variable_extra_spaces(monkeypatch, mock_config_file):
     """✅ Test that environment variable with extra spaces is trimmed correctly."""
     monkeypatch.setenv("HEALTH_DB_URL", "  https://trimmed-url.com  ")
     config = Config.load(mock_config_file)
-    assert str(config.database.url) == "https://trimmed-url.com/"
+    assert config.database.url == "https://trimmed-url.com"
 
 @pytest.mark.parametrize("mock_config_file", [VALID_CONFIG], indirect=True)
 def test_env_variable_non_string(monkeypatch, mock_config_file):
@@ -159,3 +250,7 @@ def test_generate_json_schema():
     assert "properties" in schema
     assert "database" in schema["properties"]
     assert "logging" in schema["properties"]
+
+def test_generate_json_schema_is_cached():
+    """✅ Test that the JSON schema is generated once and reused."""
+    assert Config.generate_schema() is Config.generate_schema()
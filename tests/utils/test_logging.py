@@ -4,18 +4,19 @@ import sys
 import pytest
 import logging
 import queue
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from logging.handlers import QueueHandler, RotatingFileHandler
-from pydantic import AnyHttpUrl
 from config.config import Config, CONFIG_ERRORS, LoggingConfig, HealthConfig, DatabaseConfig, CacheConfig, \
     MessagingConfig, AlertConfig
-from utils.logging_config import configure_logging, LoggingConfigurationError, SafeQueueListener
-from utils.custom_json_formatter import CustomJSONFormatter
+from utils.logging_config import configure_logging, LoggingConfigurationError, SafeQueueListener, \
+    BufferedRotatingFileHandler, StructuredQueueHandler
+from utils.custom_json_formatter import CustomJSONFormatter, reconfigure, _fast_iso, _dumps, _stdlib_dumps
 
 
-@pytest.fixture
-def mock_config():
-    """✅ Provides a mock configuration object with full required settings."""
+@pytest.fixture(scope="module")
+def mock_config_base():
+    """✅ Provides a shared, frozen mock configuration object with full required settings."""
     return Config(
         logging=LoggingConfig(
             log_level="INFO",
@@ -38,49 +39,87 @@ def mock_config():
             enable_cache_check=True,
             enable_messaging_check=True,
         ),
-        database=DatabaseConfig(url=AnyHttpUrl("https://localhost:5432/health_db")),
+        database=DatabaseConfig(url="https://localhost:5432/health_db"),
         cache=CacheConfig(host="cache.example.com", port=6379),
         messaging=MessagingConfig(host="messaging.example.com", port=5672),
-        alerts=AlertConfig(slack_webhook=AnyHttpUrl("https://hooks.slack.com/services/T00000000/B00000000/XXXXXXXXXXXX"), failure_threshold=3),
+        alerts=AlertConfig(slack_webhook="https://hooks.slack.com/services/T00000000/B00000000/XXXXXXXXXXXX", failure_threshold=3),
     )
+
+
+def _with_logging(config, **overrides):
+    """✅ Returns a copy of the (frozen) configuration with the given logging settings replaced."""
+    return config.model_copy(update={"logging": config.logging.model_copy(update=overrides)})
+
+
+@pytest.fixture(scope="module")
+def configured_logger(mock_config_base):
+    """
+    ✅ Configures logging once for read-only tests and snapshots the result.
+
+    The root logger is global and later tests reconfigure it, so tests assert on the
+    snapshot (level, handlers, listener) rather than on the live logger.
+    """
+    logger = configure_logging(mock_config_base)
+    return SimpleNamespace(logger=logger, level=logger.level, handlers=list(logger.handlers),
+                           listener=_queue_listener(logger))
+
+
+def _queue_listener(logger):
+    """✅ Returns the listener of the root logger's queue handler."""
+    return next(handler.listener for handler in logger.handlers if isinstance(handler, QueueHandler))
+
+
+def _drain_listener(logger):
+    """✅ Stops the root logger's queue listener so every queued record has been handled."""
+    for handler in logger.handlers:
+        if isinstance(handler, QueueHandler):
+            handler.listener.stop()
+
+
 @pytest.fixture(autouse=True)
 def clear_config_errors():
     """✅ Clears CONFIG_ERRORS before each test."""
     CONFIG_ERRORS.clear()
 
 
-def test_successful_logging_configuration(mock_config):
+@pytest.fixture
+def log_mocks(monkeypatch):
+    """✅ Replaces `Logger.info`, `Logger.error` and `os.chmod` with reusable mocks for one test."""
+    mocks = SimpleNamespace(info=MagicMock(), error=MagicMock(), chmod=MagicMock())
+    monkeypatch.setattr("logging.Logger.info", mocks.info)
+    monkeypatch.setattr("logging.Logger.error", mocks.error)
+    monkeypatch.setattr("os.chmod", mocks.chmod)
+    return mocks
+
+
+def test_successful_logging_configuration(configured_logger):
     """✅ Test that `configure_logging` initializes logging correctly."""
-    logger = configure_logging(mock_config)
-    assert logger is not None
-    assert isinstance(logger, logging.Logger)
-    assert any(isinstance(handler, QueueHandler) for handler in logger.handlers)
+    assert isinstance(configured_logger.logger, logging.Logger)
+    assert any(isinstance(handler, QueueHandler) for handler in configured_logger.handlers)
 
 
-def test_missing_log_directory(mock_config):
+def test_missing_log_directory(mock_config_base):
     """❌ Test that `configure_logging` raises an error when log directory creation fails."""
     with patch("os.makedirs") as mock_makedirs:
         mock_makedirs.side_effect = PermissionError("Directory creation failed")
         with pytest.raises(LoggingConfigurationError, match="❌ Error configuring logging: Directory creation failed"):
-            configure_logging(mock_config)
+            configure_logging(mock_config_base)
 
 
-def test_log_file_permissions(mock_config):
+def test_log_file_permissions(mock_config_base, log_mocks):
     """✅ Test that log file permissions are correctly set."""
-    with patch("os.chmod") as mock_chmod:
-        configure_logging(mock_config)
+    configure_logging(mock_config_base)
 
-        # ✅ Use correct attribute
-        mock_chmod.assert_any_call(mock_config.logging.log_file_path, 0o600)
-        mock_chmod.assert_any_call(mock_config.logging.error_log_file_path, 0o600)
+    # ✅ Use correct attribute
+    log_mocks.chmod.assert_any_call(mock_config_base.logging.log_file_path, 0o600)
+    log_mocks.chmod.assert_any_call(mock_config_base.logging.error_log_file_path, 0o600)
 
 
-def test_config_errors_logged(mock_config):
+def test_config_errors_logged(mock_config_base, log_mocks):
     """✅ Test that configuration errors are logged if they exist."""
     CONFIG_ERRORS.append("Fake configuration error")
-    with patch("logging.Logger.error") as mock_error_log:
-        configure_logging(mock_config)
-        mock_error_log.assert_called_with("⚠️ Configuration Error: Fake configuration error")
+    configure_logging(mock_config_base)
+    log_mocks.error.assert_called_with("⚠️ Configuration Error: Fake configuration error")
 
 
 def test_safe_queue_listener_handles_errors():
@@ -93,11 +132,81 @@ def test_safe_queue_listener_handles_errors():
     assert True, "❌ SafeQueueListener crashed when handling a failing log handler!"
 
 
-def test_exception_handling_in_configure_logging(mock_config):
+def test_safe_queue_listener_drains_in_batches():
+    """✅ Test that `SafeQueueListener` hands queued records over in batches."""
+    log_queue = queue.SimpleQueue()
+    records = [logging.LogRecord("test_logger", logging.INFO, __file__, i, "msg", (), None) for i in range(5)]
+    for record in records:
+        log_queue.put(record)
+
+    listener = SafeQueueListener(log_queue, MagicMock())
+    batches = []
+    listener.handle_batch = batches.append
+    listener.start()
+    listener.stop()
+
+    assert batches[0] == records, "❌ Queued records were not drained in one batch!"
+
+
+def test_safe_queue_listener_flushes_once_per_batch():
+    """✅ Test that handler streams are flushed once per batch, not once per record."""
+    handler = MagicMock(level=logging.NOTSET)
+    listener = SafeQueueListener(queue.SimpleQueue(), handler)
+    records = [logging.LogRecord("test_logger", logging.INFO, __file__, i, "msg", (), None) for i in range(5)]
+
+    listener.handle_batch(records)
+
+    assert handler.handle.call_count == 5
+    handler.flush.assert_called_once()
+
+
+def test_structured_queue_handler_enforces_max_size():
+    """✅ Test that records beyond `max_size` are rejected instead of growing the queue."""
+    log_queue = queue.SimpleQueue()
+    handler = StructuredQueueHandler(log_queue, max_size=1)
+    record = logging.LogRecord("test_logger", logging.INFO, __file__, 1, "msg", (), None)
+
+    with patch.object(handler, "handleError") as mock_handle_error:
+        handler.emit(record)
+        handler.emit(record)
+
+    assert log_queue.qsize() == 1
+    mock_handle_error.assert_called_once()
+
+
+def test_listener_stopped_at_exit(mock_config_base):
+    """✅ Test that the queue listener is drained at exit, and a replaced listener is unregistered."""
+    with patch("utils.logging_config.atexit") as mock_atexit:
+        first = _queue_listener(configure_logging(mock_config_base))
+        second = _queue_listener(configure_logging(mock_config_base))
+
+    assert [c.args[0] for c in mock_atexit.register.call_args_list] == [first.stop, second.stop]
+    mock_atexit.unregister.assert_any_call(first.stop)
+
+
+def test_reconfiguration_closes_previous_handlers(mock_config_base):
+    """✅ Test that reconfiguring logging closes the replaced listener's and error logger's handlers."""
+    configure_logging(mock_config_base)
+    previous = [*_queue_listener(logging.getLogger()).handlers, *logging.getLogger("logging_errors").handlers]
+    closes = [patch.object(handler, "close", wraps=handler.close) for handler in previous]
+    mocks = [close.start() for close in closes]
+    try:
+        configure_logging(mock_config_base)
+    finally:
+        for close in closes:
+            close.stop()
+
+    assert all(mock.called for mock in mocks), "❌ Replaced handlers were left open!"
+    assert len(logging.getLogger("logging_errors").handlers) == 1
+
+
+def test_exception_handling_in_configure_logging(mock_config_base, monkeypatch):
     """❌ Test that `configure_logging` raises `LoggingConfigurationError` on failure."""
+    # ✅ Keep the shared root logger's handlers intact for other tests
+    monkeypatch.setattr(logging.getLogger(), "handlers", [])
     with patch("logging.Logger.addHandler", side_effect=Exception("Unexpected failure")):
         with pytest.raises(LoggingConfigurationError, match="Error configuring logging"):
-            configure_logging(mock_config)
+            configure_logging(mock_config_base)
 
 
 def test_custom_json_formatter():
@@ -133,25 +242,81 @@ def test_custom_json_formatter():
     assert "ValueError: Test error" in log_dict["stack_trace"], "❌ Stack trace does not contain expected error message!"
 
 
-def test_log_levels(mock_config):
+def test_formatter_reconfigure(mock_config_base):
+    """✅ Test that `reconfigure` refreshes the formatter's cached feature flags."""
+    mock_config = _with_logging(mock_config_base, enable_memory_logging=False)
+    record = logging.LogRecord(name="test_logger", level=logging.INFO, pathname=__file__, lineno=10,
+                               msg="Test log message", args=(), exc_info=None, func="test_formatter_reconfigure")
+    try:
+        reconfigure(mock_config)
+        log_dict = json.loads(CustomJSONFormatter().format(record))
+        assert "memory_usage_mb" not in log_dict, "❌ Memory usage logged although disabled!"
+    finally:
+        reconfigure()
+
+
+def test_trace_fields_from_extra():
+    """✅ Test that `trace_id`/`span_id` passed via `extra` are picked up by `json_record`."""
+    record = logging.LogRecord(name="test_logger", level=logging.INFO, pathname=__file__, lineno=10,
+                               msg="Test log message", args=(), exc_info=None, func="test_trace_fields_from_extra")
+    log_dict = CustomJSONFormatter().json_record(record, "Test log message", {"trace_id": "t-1", "span_id": "s-1"})
+
+    assert log_dict["trace_id"] == "t-1"
+    assert log_dict["span_id"] == "s-1"
+
+
+def test_json_encoders_produce_identical_output():
+    """✅ Test that the orjson and standard library paths write the same JSON, including wide integers."""
+    payload = {"message": "⚠️ Configuration Error", "time": datetime(2025, 1, 1, 12, 0, 0, 123000),
+               "line": 10, "ratio": 0.5, "flags": [True, None]}
+    assert _dumps(payload) == _stdlib_dumps(payload)
+
+    assert json.loads(_dumps({"request_id": 2 ** 70}))["request_id"] == 2 ** 70
+
+
+def test_formatter_skeleton_below_min_level():
+    """✅ Test that records below `min_level` are formatted as a minimal skeleton."""
+    formatter = CustomJSONFormatter(min_level=logging.WARNING)
+    record = logging.LogRecord(name="test_logger", level=logging.INFO, pathname=__file__, lineno=10,
+                               msg="Test log message", args=(), exc_info=None, func="test_formatter_skeleton")
+
+    log_dict = json.loads(formatter.format(record))
+    assert set(log_dict) == {"message", "levelname", "timestamp"}
+    assert log_dict["message"] == "Test log message"
+
+
+def test_formatter_caches_output_per_record():
+    """✅ Test that a record is encoded once per formatter and reused across handlers."""
+    formatter = CustomJSONFormatter()
+    record = logging.LogRecord(name="test_logger", level=logging.INFO, pathname=__file__, lineno=10,
+                               msg="Test log message", args=(), exc_info=None, func="test_formatter_cache")
+
+    first = formatter.format(record)
+    assert formatter.format(record) is first
+    assert "_json_cache" not in json.loads(first)
+
+    # ✅ A different formatter instance must not reuse another formatter's output
+    other = CustomJSONFormatter(min_level=logging.ERROR)
+    assert set(json.loads(other.format(record))) == {"message", "levelname", "timestamp"}
+
+
+def test_log_levels(configured_logger):
     """✅ Test that log levels are correctly set."""
-    logger = configure_logging(mock_config)
-    assert logger.level == logging.INFO
+    assert configured_logger.level == logging.INFO
 
 
-def test_extra_dictionary_in_logs(mock_config):
+def test_extra_dictionary_in_logs(configured_logger, log_mocks):
     """✅ Test that `extra` dictionary fields are correctly added to log records."""
-    logger = configure_logging(mock_config)
+    logger = configured_logger.logger
 
-    with patch("logging.Logger.info") as mock_info_log:
-        logger.info("Test message", extra={"custom_field": "test_value"})
-        mock_info_log.assert_any_call("Test message", extra={"custom_field": "test_value"})
+    logger.info("Test message", extra={"custom_field": "test_value"})
+    log_mocks.info.assert_any_call("Test message", extra={"custom_field": "test_value"})
 
 
-def test_rotating_file_handler(mock_config):
+def test_rotating_file_handler(mock_config_base):
     """✅ Test that `RotatingFileHandler` correctly rotates log files."""
     # ✅ Force log rotation by setting a very small max file size
-    mock_config.logging.max_log_file_size = 1  # 1 byte to ensure rotation
+    mock_config = _with_logging(mock_config_base, max_log_file_size=1)  # 1 byte to ensure rotation
 
     with patch("logging.handlers.RotatingFileHandler.doRollover") as mock_rollover:
         logger = configure_logging(mock_config)
@@ -159,41 +324,146 @@ def test_rotating_file_handler(mock_config):
         # ✅ Write multiple large log entries to trigger rollover
         for _ in range(10):
             logger.info("X" * 1024)  # ✅ Writing 1KB per log
+        _drain_listener(logger)
 
         # ✅ Ensure log file rollover is triggered
         mock_rollover.assert_called(), "❌ Log file rollover was not triggered!"
 
 
-def test_logging_memory_usage(mock_config):
-    """✅ Test that memory usage is logged when enabled."""
-    mock_config.logging.enable_memory_logging = True  # ✅ Ensure memory logging is enabled
+def test_buffered_rotating_file_handler(tmp_path):
+    """✅ Test that `BufferedRotatingFileHandler` buffers records, flushes errors and still rotates."""
+    log_file = tmp_path / "buffered.log"
+    handler = BufferedRotatingFileHandler(str(log_file), maxBytes=200, backupCount=1, check_every=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
 
-    with patch("utils.logging_config.get_memory_usage", return_value=123.45) as mock_memory_usage, \
-         patch("logging.Logger.info") as mock_info_log:
+    def make_record(level, msg):
+        return logging.LogRecord("test_logger", level, __file__, 1, msg, (), None)
 
-        configure_logging(mock_config)  # ✅ This should now call `get_memory_usage()`
+    handler.emit(make_record(logging.INFO, "buffered"))
+    assert log_file.read_text() == "", "❌ INFO record was flushed immediately!"
 
-        # ✅ Ensure function was called
-        mock_memory_usage.assert_called_once(), "❌ `get_memory_usage()` was never called!"
+    handler.emit(make_record(logging.ERROR, "urgent"))
+    assert log_file.read_text() == "buffered\nurgent\n", "❌ ERROR record was not flushed!"
 
+    handler.emit(make_record(logging.INFO, "X" * 300))  # ✅ Exceeds maxBytes, forcing a rollover
+    handler.close()
+    assert (tmp_path / "buffered.log.1").read_text() == "buffered\nurgent\n"
+    assert log_file.read_text() == "X" * 300 + "\n"
 
-from typing import Type
 
-def test_correct_handlers_added(mock_config):
-    """✅ Test that the correct handlers are added to the logger."""
-    logger = configure_logging(mock_config)
+def test_buffered_rotating_file_handler_defaults_to_utf8(tmp_path):
+    """✅ Test that non-ASCII records are written as UTF-8 regardless of the locale encoding."""
+    log_file = tmp_path / "utf8.log"
+    handler = BufferedRotatingFileHandler(str(log_file))
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    with patch.object(handler, "handleError") as mock_handle_error:
+        handler.emit(logging.LogRecord("test_logger", logging.INFO, __file__, 1, "⚠️ Configuration Error: x", (), None))
+    handler.close()
+
+    mock_handle_error.assert_not_called()
+    assert log_file.read_bytes().decode("utf-8") == "⚠️ Configuration Error: x\n"
+
+
+def test_buffered_rotating_file_handler_locale_encoding(tmp_path):
+    """✅ Test that the text-mode `"locale"` encoding default still writes records (UTF-8 mode off)."""
+    log_file = tmp_path / "locale.log"
+    handler = BufferedRotatingFileHandler(str(log_file), encoding="locale")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    with patch.object(handler, "handleError") as mock_handle_error:
+        handler.emit(logging.LogRecord("test_logger", logging.INFO, __file__, 1, "written", (), None))
+    handler.close()
+
+    mock_handle_error.assert_not_called()
+    assert log_file.read_text(encoding=handler.encoding) == "written\n"
 
-    # ✅ Extract handler types
-    handler_types: set[Type[logging.Handler]] = {type(handler) for handler in logger.handlers}
 
-    # ✅ Ensure required handlers are present
-    expected_handlers: set[Type[logging.Handler]] = {QueueHandler, RotatingFileHandler, logging.StreamHandler}
+def test_buffered_rotating_file_handler_checks_every_n(tmp_path):
+    """✅ Test that the size limit is checked on the first record and then every `check_every` records."""
+    handler = BufferedRotatingFileHandler(str(tmp_path / "sampled.log"), maxBytes=1, check_every=3)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    record = logging.LogRecord("test_logger", logging.INFO, __file__, 1, "msg", (), None)
+
+    checks = [handler.shouldRollover(record) for _ in range(7)]
+    handler.close()
+
+    assert checks == [True, False, False, True, False, False, True]
+
+
+def test_logging_memory_usage(mock_config_base, log_mocks, monkeypatch):
+    """✅ Test that memory usage is logged when enabled."""
+    mock_config = _with_logging(mock_config_base, enable_memory_logging=True)  # ✅ Ensure memory logging is enabled
+    mock_memory_usage = MagicMock(return_value=123.45)
+    monkeypatch.setattr("utils.logging_config.get_memory_usage", mock_memory_usage)
+
+    configure_logging(mock_config)  # ✅ This should now call `get_memory_usage()`
+
+    # ✅ Ensure function was called
+    mock_memory_usage.assert_called_once(), "❌ `get_memory_usage()` was never called!"
+    log_mocks.info.assert_called_once_with("ℹ️ Logging system initialized", extra={"memory_usage_mb": 123.45})
+
+
+from typing import Type
+
+def test_correct_handlers_added(configured_logger):
+    """✅ Test that the correct handlers are added to the logger."""
+    handlers = configured_logger.handlers
+
+    # ✅ Only the QueueHandler routes records from the root logger
+    queue_handlers = [handler for handler in handlers if isinstance(handler, QueueHandler)]
+    root_types: set[Type[logging.Handler]] = {type(handler) for handler in handlers}
+    assert len(queue_handlers) == 1, f"❌ Expected one QueueHandler, got: {handlers}"
+    assert queue_handlers[0].listener is configured_logger.listener
+    assert not root_types & {RotatingFileHandler, logging.StreamHandler}, "❌ Records would be written twice!"
+
+    # ✅ File and console output are owned by the queue listener
+    handler_types: set[Type[logging.Handler]] = {type(handler) for handler in configured_logger.listener.handlers}
+    expected_handlers: set[Type[logging.Handler]] = {BufferedRotatingFileHandler, logging.StreamHandler}
     missing_handlers = expected_handlers - handler_types  # 🔧 This now avoids type mismatches
 
     assert not missing_handlers, f"❌ Missing handlers: {missing_handlers}"
 
 
-def test_stack_trace_logging_production(mock_config):
+def test_exception_formatted_once():
+    """✅ Test that `exc_info` and `stack_trace` share a single traceback format."""
+    import utils.custom_json_formatter as formatter_module
+
+    formatter = CustomJSONFormatter()
+    try:
+        raise ValueError("Formatted once")
+    except ValueError as e:
+        exc_info = (type(e), e, e.__traceback__)
+    record = logging.LogRecord(name="test_logger", level=logging.ERROR, pathname=__file__, lineno=10,
+                               msg="Test log message", args=(), exc_info=exc_info, func="test_formatted_once")
+
+    with patch.object(formatter_module, "_format_exception", wraps=formatter_module._format_exception) as spy:
+        log_dict = json.loads(formatter.format(record))
+
+    spy.assert_called_once()
+    assert log_dict["stack_trace"] == log_dict["exc_info"] + "\n"
+    assert "ValueError: Formatted once" in log_dict["exc_info"]
+
+
+def test_warning_with_exc_info_has_stack_trace():
+    """✅ Test that records below ERROR still carry a stack trace when they include exception info."""
+    formatter = CustomJSONFormatter()
+    try:
+        raise KeyError("missing")
+    except KeyError as e:
+        exc_info = (type(e), e, e.__traceback__)
+    record = logging.LogRecord(name="test_logger", level=logging.WARNING, pathname=__file__, lineno=10,
+                               msg="Recovered", args=(), exc_info=exc_info, func="test_warning_exc_info")
+
+    log_dict = json.loads(formatter.format(record))
+    assert "KeyError: 'missing'" in log_dict["stack_trace"]
+
+    record.exc_info = None
+    record.__dict__.pop("_json_cache")
+    assert "stack_trace" not in json.loads(formatter.format(record))
+
+
+def test_stack_trace_logging_production(mock_config_base):
     """✅ Ensure stack traces are captured in production-style logging."""
 
     formatter = CustomJSONFormatter()  # ✅ Directly use the formatter to verify stack trace
@@ -222,16 +492,15 @@ def test_stack_trace_logging_production(mock_config):
             "❌ Stack trace does not contain expected error message!"
 
 
-def test_request_metadata_logging_enabled(mock_config):
+def test_request_metadata_logging_enabled(mock_config_base, log_mocks):
     """✅ Test that request metadata is logged when `enable_request_metadata` is enabled."""
-    mock_config.logging.enable_request_metadata = True  # Ensure setting is enabled
+    mock_config = _with_logging(mock_config_base, enable_request_metadata=True)  # Ensure setting is enabled
     logger = configure_logging(mock_config)
 
-    with patch("logging.Logger.info") as mock_info_log:
-        logger.info("Test request metadata", extra={"request_id": "12345", "user_id": "67890", "feed_type": "home_feed"})
+    logger.info("Test request metadata", extra={"request_id": "12345", "user_id": "67890", "feed_type": "home_feed"})
 
     # ✅ Extract logged metadata
-    args, kwargs = mock_info_log.call_args
+    args, kwargs = log_mocks.info.call_args
     log_entry = kwargs.get("extra", {})
 
     assert log_entry.get("request_id") == "12345", "❌ request_id is missing from log!"
@@ -261,15 +530,67 @@ def test_timestamp_format():
         pytest.fail(f"❌ Timestamp format is incorrect: {timestamp}")
 
 
-def test_error_log_file(mock_config):
+def test_fast_iso_timestamp_cache():
+    """✅ Test that cached timestamps match `strftime` output within and across seconds."""
+    assert _fast_iso(1700000000.25, 250.0) == "2023-11-14T22:13:20.250Z"
+    assert _fast_iso(1700000000.9, 900.7) == "2023-11-14T22:13:20.900Z"
+    assert _fast_iso(1700000001.0, 0.0) == "2023-11-14T22:13:21.000Z"
+
+
+@pytest.mark.parametrize("rate, kept", [(0.1, 10), (0.4, 40), (0.75, 75), (1.0, 100), (0.0, 0)])
+def test_should_sample_log_keeps_configured_rate(monkeypatch, rate, kept):
+    """✅ Test that log sampling keeps exactly `rate` of the calls, including rates that are not 1/N."""
+    import itertools
+    import utils.logging_helpers as helpers
+
+    monkeypatch.setattr(helpers, "LOG_SAMPLING_RATE", rate)
+    monkeypatch.setattr(helpers, "_sample_counter", itertools.count())
+    assert sum(helpers.should_sample_log() for _ in range(100)) == kept
+
+
+def test_memory_usage_is_sampled_once_per_ttl(monkeypatch):
+    """✅ Test that `get_memory_usage` reuses its sample within the TTL window."""
+    import utils.logging_helpers as helpers
+
+    mock_process = MagicMock()
+    mock_process.memory_info.return_value.rss = 100 * 1048576
+    monkeypatch.setattr(helpers, "_PROC", mock_process)
+    monkeypatch.setattr(helpers, "_mem_cache", [float("-inf"), "UNKNOWN"])
+
+    assert helpers.get_memory_usage() == 100.0
+    assert helpers.get_memory_usage() == 100.0
+    mock_process.memory_info.assert_called_once()
+
+
+def test_error_log_file(mock_config_base):
     """✅ Test that errors are correctly written to the error log file."""
-    logger = configure_logging(mock_config)
+    logger = configure_logging(mock_config_base)
 
-    with patch("logging.handlers.RotatingFileHandler.emit") as mock_emit:
+    with patch("utils.logging_config.BufferedRotatingFileHandler.emit") as mock_emit:
         try:
             raise RuntimeError("Critical failure")
         except RuntimeError:
             logger.exception("A critical error occurred")
+        _drain_listener(logger)
 
     # ✅ Ensure error log handler was triggered
     mock_emit.assert_called()
+
+
+def test_queued_exception_keeps_stack_trace(mock_config_base, tmp_path):
+    """✅ Test that exceptions logged through the queue keep a structured stack trace."""
+    log_file = tmp_path / "queued.log"
+    logger = configure_logging(_with_logging(
+        mock_config_base, log_file_path=str(log_file), error_log_file_path=str(tmp_path / "queued_errors.log")
+    ))
+    try:
+        raise RuntimeError("Queued failure")
+    except RuntimeError:
+        logger.exception("A queued error occurred")
+    _drain_listener(logger)
+
+    lines = log_file.read_text().splitlines()
+    log_dict = json.loads(lines[-1])
+
+    assert log_dict["message"] == "A queued error occurred"
+    assert "RuntimeError: Queued failure" in log_dict["stack_trace"], "❌ Stack trace lost in the queue!"
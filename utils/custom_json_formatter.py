@@ -11,8 +11,113 @@ from utils.logging_helpers import get_memory_usage
 from config.config import load_config
 import logging
 
+# ✅ Prefer orjson (native, serializes datetime directly); fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 config = load_config()
 
+# ✅ Logging feature flags read once (per-record attribute lookups are on the hot path)
+_REQ_META = config.logging.enable_request_metadata
+_EXEC = config.logging.enable_execution_time_logging
+_MEM = config.logging.enable_memory_logging
+
+# ✅ System context never changes for the process lifetime, so resolve it once
+_HOSTNAME = socket.gethostname()
+_ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+
+# ✅ Zero-padded millisecond strings, indexed by `int(msecs)`
+_MS = tuple(f"{i:03d}" for i in range(1000))
+
+# ✅ Last formatted second as `(epoch_second, "YYYY-MM-DDTHH:MM:SS")`, swapped atomically
+_ts_cache = (-1, "")
+
+
+def _fast_iso(created, msecs):
+    """
+    Formats a record time as ISO 8601 UTC with milliseconds, reusing the formatted second.
+
+    Args:
+        created (float): `LogRecord.created` epoch seconds.
+        msecs (float): `LogRecord.msecs` millisecond fraction.
+
+    Returns:
+        str: Timestamp such as `2025-01-01T12:00:00.123Z`.
+    """
+    global _ts_cache
+    sec = int(created)
+    cached_sec, cached_str = _ts_cache
+    if sec != cached_sec:
+        cached_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, cached_str)
+    return cached_str + "." + _MS[int(msecs)] + "Z"
+
+
+# ✅ LogRecord attributes left out of `extra`: internal state, or fields `json_record` emits under its own keys
+_SKIP_EXTRA_FIELDS = frozenset((
+    "args", "msg", "exc_info", "exc_text", "created", "msecs", "relativeCreated", "stack_info",
+    "levelname", "module", "funcName", "lineno", "process", "thread", "message", "asctime",
+    "_formatted_extra", "_json_cache",
+))
+
+
+def _format_exception(exc_info):
+    """
+    Formats an `exc_info` tuple as a traceback string.
+
+    `lookup_lines=False` defers reading source lines until the traceback is rendered.
+
+    Args:
+        exc_info (tuple): `(type, value, traceback)` as stored on `LogRecord.exc_info`.
+
+    Returns:
+        str: The formatted traceback, ending with a newline.
+    """
+    exc_type, exc_value, exc_traceback = exc_info  # Unpack directly
+    if not isinstance(exc_traceback, TracebackType):  # ✅ Ensure traceback is valid
+        exc_traceback = None
+    trace = traceback.TracebackException(exc_type, exc_value, exc_traceback, lookup_lines=False)
+    return "".join(trace.format())
+
+
+def _json_default(value):
+    """Serializes `datetime` values for the standard library encoder (orjson handles them natively)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(payload):
+    """Serializes a log payload to a JSON string in the same format orjson produces (compact, unescaped UTF-8)."""
+    return json.dumps(payload, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+if orjson is not None:
+    def _dumps(payload):
+        """Serializes a log payload to a JSON string."""
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # ✅ e.g. integers wider than 64 bits, which the standard library encoder still handles
+            return _stdlib_dumps(payload)
+else:
+    _dumps = _stdlib_dumps
+
+
+def reconfigure(new_config=None):
+    """
+    Refreshes the cached logging feature flags, e.g. after the configuration is reloaded.
+
+    Args:
+        new_config (Config, optional): Configuration to use. Defaults to `load_config()`.
+    """
+    global config, _REQ_META, _EXEC, _MEM
+    config = new_config or load_config()
+    _REQ_META = config.logging.enable_request_metadata
+    _EXEC = config.logging.enable_execution_time_logging
+    _MEM = config.logging.enable_memory_logging
 
 
 class CustomJSONFormatter(json_log_formatter.JSONFormatter):
@@ -28,52 +133,41 @@ class CustomJSONFormatter(json_log_formatter.JSONFormatter):
     - ✅ Captures execution time & memory usage if enabled in settings.
     - ✅ Includes stack trace for errors while ensuring safe error handling.
     - ✅ Configurable fields to enable/disable specific logging details.
+    - ✅ Emits a skeleton record (message, level, timestamp) below `min_level`.
     """
 
+    def __init__(self, *args, min_level=logging.NOTSET, **kwargs):
+        """
+        Args:
+            min_level (int, optional): Lowest level any attached handler keeps; records below it
+                are formatted as a minimal skeleton. Defaults to `logging.NOTSET` (always full).
+        """
+        super().__init__(*args, **kwargs)
+        self.min_level = min_level
+
     def format(self, record):
         """
         Overrides `format()` to ensure `record` is passed correctly to `json_record`.
+
+        The output is cached on the record as `(formatter, json)`, so the handlers sharing this
+        formatter encode each record once; another formatter instance always re-formats.
         """
+        cached = record.__dict__.get("_json_cache")
+        if cached is not None and cached[0] is self:
+            return cached[1]
+
         message = record.getMessage()
-        extra = self._extract_extra_fields(record)  # ✅ Extract extra fields into a dictionary
+        # ✅ Extract extra fields into a dictionary (not needed for skeleton records)
+        extra = self._extract_extra_fields(record) if record.levelno >= self.min_level else None
 
         structured_record = self.json_record(log_record=record,message=message, extra=extra)
 
-        # ✅ Add log level and timestamp
+        # ✅ Add log level (all other fields are populated once by `json_record`)
         structured_record["levelname"] = record.levelname
-        structured_record["timestamp"] = time.strftime(
-            "%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)
-        ) + f".{int(record.msecs):03d}Z"
-
-        # ✅ Ensure `time` is JSON serializable (Convert `datetime` to `str`)
-        if isinstance(structured_record.get("time"), datetime):
-            structured_record["time"] = structured_record["time"].isoformat()
-
-
-        # ✅ Ensure structured debugging details are captured
-        structured_record.update({
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno,
-            "process": record.process,
-            "thread": record.thread,
-            "hostname": socket.gethostname(),
-            "environment": os.getenv("ENVIRONMENT", "development"),
-        })
-
-        # ✅ Capture execution time if enabled
-        if config.logging.enable_execution_time_logging:
-            structured_record["execution_time_ms"] = getattr(record, "execution_time_ms", "UNKNOWN")
-
-        # ✅ Capture memory usage if enabled
-        if config.logging.enable_memory_logging:
-            structured_record["memory_usage_mb"] = get_memory_usage()
-
-        # ✅ Log stack trace safely
-        if record.exc_info:
-            structured_record["stack_trace"] = "".join(traceback.format_exception(*record.exc_info))
 
-        return json.dumps(structured_record)
+        output = _dumps(structured_record)
+        record._json_cache = (self, output)
+        return output
 
     def json_record(self, log_record, message, extra=None):
         """
@@ -87,82 +181,97 @@ class CustomJSONFormatter(json_log_formatter.JSONFormatter):
         Returns:
             dict: A structured log entry in JSON format.
         """
+        # ✅ Skip the full payload for records below every handler's threshold
+        if log_record.levelno < self.min_level:
+            return {
+                "message": message,
+                "levelname": log_record.levelname,
+                "timestamp": _fast_iso(log_record.created, log_record.msecs),
+            }
+
         if not isinstance(extra, dict):
             extra = {}
 
         record = super().json_record(message, extra, log_record)
 
+        # ✅ LogRecord attributes (including `extra`) live in `__dict__`
+        g = log_record.__dict__.get
+
         # ✅ Add request metadata if enabled
-        if config.logging.enable_request_metadata:
-            if isinstance(extra, dict): #Check if extra is a dict.
-                record["request_id"] = getattr(log_record, "request_id", extra.get("request_id", "UNKNOWN"))
-                record["user_id"] = getattr(log_record, "user_id", extra.get("user_id", "UNKNOWN"))
-                record["feed_type"] = getattr(log_record, "feed_type", extra.get("feed_type", "UNKNOWN"))
-            else:
-                record["request_id"] = getattr(log_record, "request_id", "UNKNOWN")
-                record["user_id"] = getattr(log_record, "user_id", "UNKNOWN")
-                record["feed_type"] = getattr(log_record, "feed_type", "UNKNOWN")
+        if _REQ_META:
+            record["request_id"] = g("request_id") or extra.get("request_id", "UNKNOWN")
+            record["user_id"] = g("user_id") or extra.get("user_id", "UNKNOWN")
+            record["feed_type"] = g("feed_type") or extra.get("feed_type", "UNKNOWN")
 
         # ✅ Add traceability fields (used for distributed tracing in microservices)
-        record["trace_id"] = getattr(log_record, "trace_id", getattr(extra, "trace_id", "UNKNOWN") if extra else "UNKNOWN")
-        record["span_id"] = getattr(log_record, "span_id", getattr(extra, "span_id", "UNKNOWN") if extra else "UNKNOWN")
+        record["trace_id"] = g("trace_id") or extra.get("trace_id", "UNKNOWN")
+        record["span_id"] = g("span_id") or extra.get("span_id", "UNKNOWN")
 
         # ✅ Include debugging details
-        record["module"] = getattr(log_record, "module", "UNKNOWN")
-        record["function"] = getattr(log_record, "funcName", "UNKNOWN")
-        record["line"] = getattr(log_record, "lineno", "UNKNOWN")
-        record["process"] = getattr(log_record, "process", "UNKNOWN")
-        record["thread"] = getattr(log_record, "thread", "UNKNOWN")
+        record["module"] = g("module", "UNKNOWN")
+        record["function"] = g("funcName", "UNKNOWN")
+        record["line"] = g("lineno", "UNKNOWN")
+        record["process"] = g("process", "UNKNOWN")
+        record["thread"] = g("thread", "UNKNOWN")
 
         # ✅ Add system context
-        record["hostname"] = socket.gethostname()
-        record["environment"] = os.getenv("ENVIRONMENT", "development")
+        record["hostname"] = _HOSTNAME
+        record["environment"] = _ENVIRONMENT
 
         # ✅ Use ISO 8601 format with milliseconds for precise timestamping
-        record["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S",
-                                            time.gmtime(log_record.created)) + f".{int(log_record.msecs):03d}Z"
-
-        # ✅ Ensure all datetime objects are converted before serialization
-        record["time"] = record["time"].isoformat() if isinstance(record.get("time"), datetime) else record.get("time")
+        record["timestamp"] = _fast_iso(log_record.created, log_record.msecs)
 
         # ✅ Capture execution time if enabled
-        if config.logging.enable_execution_time_logging:
-            record["execution_time_ms"] = getattr(log_record, "execution_time_ms", "UNKNOWN")
+        if _EXEC:
+            record["execution_time_ms"] = g("execution_time_ms", "UNKNOWN")
 
         # ✅ Capture memory usage if enabled
-        if config.logging.enable_memory_logging:
+        if _MEM:
             record["memory_usage_mb"] = get_memory_usage()
 
         # ✅ Log stack trace safely
         try:
-            # ✅ Print what's inside log_record before extracting exc_info
-
-            if log_record.levelname in ["ERROR", "CRITICAL"] and log_record.exc_info is not None:
-                exc_type, exc_value, exc_traceback = log_record.exc_info  # Unpack directly
-
-                if isinstance(exc_traceback, TracebackType):  # ✅ Ensure traceback is valid
-                    record["stack_trace"] = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
-                else:
-                    record["stack_trace"] = "".join(traceback.format_exception(exc_type, exc_value))
-            elif log_record.levelname in ["ERROR", "CRITICAL"] and log_record.exc_info is None:
+            # ✅ Any record carrying exception info (e.g. `logger.warning(..., exc_info=True)`) gets its trace
+            if log_record.exc_info is not None:
+                # ✅ Reuse the traceback `json_log_formatter` already put under `exc_info`
+                formatted = record.get("exc_info")
+                record["stack_trace"] = (formatted + "\n" if isinstance(formatted, str)
+                                         else _format_exception(log_record.exc_info))
+            elif log_record.levelno >= logging.ERROR:
                 record["stack_trace"] = "⚠️ Exception occurred, but no exception info was available."
 
         except Exception as e:
             record["stack_trace"] = f"⚠️ Error retrieving stack trace: {str(e)}"
         return record
 
+    def formatException(self, ei):
+        """
+        Formats exception info for the `exc_info` field through the same path as `stack_trace`.
+
+        Args:
+            ei (tuple): `(type, value, traceback)` as stored on `LogRecord.exc_info`.
+
+        Returns:
+            str: The formatted traceback, without the trailing newline (as `logging.Formatter`).
+        """
+        formatted = _format_exception(ei)
+        return formatted[:-1] if formatted[-1:] == "\n" else formatted
+
     def _extract_extra_fields(self, record):
         """
         Extracts additional log fields from the `record` object.
 
+        The result is cached on the record, so each handler formatting the same record
+        reuses it instead of scanning `record.__dict__` again.
+
         Args:
             record (logging.LogRecord): The log record containing log details.
 
         Returns:
-            dict: Extracted extra fields.
+            dict: Extracted extra fields (a fresh copy the caller may modify).
         """
-        extra_fields = {}
-        for key, value in record.__dict__.items():
-            if key not in ["args", "msg", "exc_info", "exc_text", "created", "msecs", "relativeCreated", "stack_info"]:
-                extra_fields[key] = value
-        return extra_fields
\ No newline at end of file
+        extra_fields = record.__dict__.get("_formatted_extra")
+        if extra_fields is None:
+            extra_fields = {key: value for key, value in record.__dict__.items() if key not in _SKIP_EXTRA_FIELDS}
+            record._formatted_extra = extra_fields
+        return extra_fields.copy()
\ No newline at end of file
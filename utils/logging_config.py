@@ -1,4 +1,7 @@
+import atexit
+import copy
 import inspect
+import locale
 import os
 import logging
 import queue
@@ -11,12 +14,162 @@ class LoggingConfigurationError(Exception):
     """Custom exception for logging configuration errors."""
     pass
 
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue that keeps `exc_info` on queued records.
+
+    The stock `prepare()` pre-formats the message and drops exception info so records can be
+    pickled; records here never leave the process, so `CustomJSONFormatter` on the listener
+    thread can still emit a structured `stack_trace`.
+
+    Designed for an unbounded `queue.SimpleQueue` (no Python-level lock per `put`), with the
+    size limit enforced here: records are rejected once `max_size` records are waiting.
+    """
+
+    def __init__(self, queue, max_size=0):
+        super().__init__(queue)
+        self.max_size = max_size
+
+    def enqueue(self, record):
+        """
+        Enqueues a record, raising `queue.Full` (reported via `handleError`) when the queue is full.
+        """
+        if self.max_size and self.queue.qsize() >= self.max_size:
+            raise queue.Full(f"Logging queue is full ({self.max_size} records)")
+        self.queue.put_nowait(record)
+
+    def prepare(self, record):
+        """
+        Merges the message arguments on a copy of the record, leaving exception info intact.
+        """
+        record = copy.copy(record)  # ✅ Don't affect other handlers in the chain (bpo-35726)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes through a 64 KiB buffer instead of flushing every record.
+
+    Buffered data is flushed for records at ERROR or above, after each batch `SafeQueueListener`
+    handles, on rollover and on close (`logging.shutdown()` runs at interpreter exit).
+
+    The size limit is checked on the first record and then every `check_every` records, so a
+    file may overshoot `maxBytes` by at most that many records before it rotates.
+
+    Records are written as UTF-8 unless another `encoding` is given.
+    """
+
+    buffer_size = 65536
+
+    def __init__(self, filename, mode="a", maxBytes=0, backupCount=0, encoding=None, delay=False, errors=None,
+                 check_every=512):
+        # ✅ JSON logs default to UTF-8 rather than the locale encoding (which may not cover non-ASCII text)
+        super().__init__(filename, mode, maxBytes, backupCount, encoding or "utf-8", delay, errors)
+        # ✅ Records are encoded by hand, and `"locale"` is not a codec name
+        if self.encoding == "locale":
+            self.encoding = locale.getpreferredencoding(False)
+        self.check_every = max(1, check_every)
+        self._until_check = 0  # ✅ Records left before the next size check
+
+    def _open(self):
+        """
+        Opens the log file in binary mode with a large write buffer.
+        """
+        return open(self.baseFilename, self.mode + "b", buffering=self.buffer_size)
+
+    def shouldRollover(self, record):
+        """
+        Checks the size limit from the buffered position; unlike the base class this doesn't
+        `seek()` (which would flush the buffer) or `stat()` the file for every record.
+        """
+        if self._until_check:
+            self._until_check -= 1
+            return False
+        self._until_check = self.check_every - 1
+
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = "%s\n" % self.format(record)
+            if self.stream.tell() + len(msg) >= self.maxBytes:
+                # See bpo-45401: Never rollover anything other than regular files
+                return not os.path.exists(self.baseFilename) or os.path.isfile(self.baseFilename)
+        return False
+
+    def emit(self, record):
+        """
+        Writes the encoded record to the buffer, rolling over first if needed.
+        """
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg.encode(self.encoding, self.errors or "strict"))
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()  # ✅ Don't leave errors sitting in the buffer
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
 class SafeQueueListener(QueueListener):
     """
     Custom QueueListener that wraps handler execution with error handling.
     This prevents silent logging failures if a handler throws an exception.
+
+    Records are drained in batches of up to `batch_size` per wake-up, and handler
+    streams are flushed once per batch rather than once per record.
     """
 
+    batch_size = 128
+
+    def _monitor(self):
+        """
+        Blocks for one record, then drains whatever else is queued (up to `batch_size`)
+        and passes the batch to `handle_batch()`. Stops at the sentinel.
+        """
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        stopping = False
+        while not stopping:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            if self._sentinel in batch:
+                stopping = True
+                batch = [record for record in batch if record is not self._sentinel]
+                if has_task_done:
+                    q.task_done()
+
+            if batch:  # ✅ The sentinel may arrive alone; there is nothing to handle or flush
+                self.handle_batch(batch)
+            if has_task_done:
+                for _ in batch:
+                    q.task_done()
+
+    def handle_batch(self, records):
+        """
+        Process a batch of log records from the queue, then flush each handler's stream once.
+        """
+        for record in records:
+            self.handle(record)
+
+        # ✅ One flush per batch (only handlers that currently hold an open stream)
+        for handler in self.handlers:
+            if getattr(handler, "stream", None) is not None:
+                try:
+                    handler.flush()
+                except Exception as e:
+                    print(f"❌ Logging error while flushing handler: {e}")  # Last-resort fallback to stderr
+
     def handle(self, record):
         """
         Process log records from the queue with error handling.
@@ -26,11 +179,18 @@ class SafeQueueListener(QueueListener):
         except Exception as e:
             print(f"❌ Logging error while processing queue record: {e}")  # Last-resort fallback to stderr
 
+    def stop(self):
+        """
+        Stops the listener thread after it has handled all queued records. Safe to call more than once.
+        """
+        if self._thread is not None:
+            super().stop()
+
 def configure_logging(config: Config):
     """
     Configures structured JSON logging with:
     - ✅ Asynchronous logging via QueueHandler for performance.
-    - ✅ RotatingFileHandler with customizable rotation settings.
+    - ✅ Buffered RotatingFileHandler with customizable rotation settings.
     - ✅ Separate log levels for file and console.
     - ✅ SafeQueueListener to prevent silent logging failures.
     - ✅ Configurable log file location and security measures.
@@ -65,20 +225,25 @@ def configure_logging(config: Config):
                 open(path, "a").close()  # ✅ Create empty log file if it doesn't exist
             os.chmod(path, 0o600)  # ✅ Now safe to change permissions
 
-        # ✅ Create structured JSON formatter
-        formatter = CustomJSONFormatter()
+        # ✅ Create structured JSON formatter (full payloads only for levels a handler keeps)
+        formatter = CustomJSONFormatter(
+            min_level=min(logging.getLevelName(file_log_level), logging.getLevelName(console_log_level))
+        )
 
         # ✅ Set up async logging queue
-        log_queue = queue.Queue(max_queue_size)
-        queue_handler = QueueHandler(log_queue)
+        log_queue = queue.SimpleQueue()
+        queue_handler = StructuredQueueHandler(log_queue, max_size=max_queue_size)
 
         # ✅ File Handler (Rotating logs with configurable settings)
-        file_handler = RotatingFileHandler(log_file, maxBytes=max_log_file_size, backupCount=max_backup_files)
+        # ✅ `delay=True`: files are opened on the first record, so a failed configuration leaves nothing open
+        file_handler = BufferedRotatingFileHandler(log_file, maxBytes=max_log_file_size, backupCount=max_backup_files,
+                                                   delay=True)
         file_handler.setFormatter(formatter)
         file_handler.setLevel(file_log_level)
 
         # ✅ Error Log Handler (for internal logging failures)
-        error_handler = RotatingFileHandler(error_log_file, maxBytes=max_log_file_size, backupCount=max_backup_files)
+        error_handler = RotatingFileHandler(error_log_file, maxBytes=max_log_file_size, backupCount=max_backup_files,
+                                            encoding="utf-8", delay=True)
         error_handler.setFormatter(formatter)
         error_handler.setLevel(logging.ERROR)
 
@@ -89,21 +254,34 @@ def configure_logging(config: Config):
 
         # ✅ Safe Queue Listener with error handling
         listener = SafeQueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
-        listener.start()  # ✅ Start logging thread
+        queue_handler.listener = listener  # ✅ Same attribute `logging.config` uses (Python 3.12+)
 
         # ✅ Configure root logger
         logger = logging.getLogger()
         if logger.hasHandlers():
+            # ✅ Drain and stop the listener of a previous configuration before replacing it
+            for handler in logger.handlers:
+                previous_listener = getattr(handler, "listener", None)
+                if previous_listener is not None:
+                    previous_listener.stop()
+                    atexit.unregister(previous_listener.stop)
+                    for previous_handler in previous_listener.handlers:
+                        previous_handler.close()  # ✅ Release the replaced configuration's log files
             logger.handlers.clear()
-        # ✅ Ensure StreamHandler is explicitly added
-        logger.addHandler(stream_handler)  # 🔥 Add console logging (StreamHandler)
-        logger.addHandler(file_handler)  # ✅ Ensure logs go directly to file as well
-        logger.addHandler(queue_handler)  # ✅ Uses QueueHandler to route logs
+        # ✅ Only the QueueHandler is attached: the listener owns the file and console handlers,
+        # so each record is formatted and written once, off the calling thread
+        logger.addHandler(queue_handler)
+        listener.start()  # ✅ Start logging thread once the queue handler is owned by the root logger
+        # ✅ The listener thread is a daemon: drain it at exit (before `logging.shutdown()` closes the handlers)
+        atexit.register(listener.stop)
         logger.setLevel(log_level)
         logger.propagate = False
 
         # ✅ Separate logger for logging errors
         error_logger = logging.getLogger("logging_errors")
+        for previous_handler in error_logger.handlers[:]:
+            error_logger.removeHandler(previous_handler)  # ✅ Replace (and close) a previous configuration's handler
+            previous_handler.close()
         error_logger.addHandler(error_handler)
         error_logger.setLevel(logging.ERROR)
 
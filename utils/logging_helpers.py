@@ -1,36 +1,66 @@
 import functools
+import itertools
 import os
-import random
 import time
 
 import psutil
 
 LOG_SAMPLING_RATE = float(os.getenv("LOG_SAMPLING_RATE", 0.1))  # ✅ Default: 10%
 
+# ✅ Deterministic sampling: call counter for a fractional accumulator (see `should_sample_log`)
+_sample_counter = itertools.count()
+
+# ✅ Reuse one process handle instead of constructing `psutil.Process()` per call
+_PROC = psutil.Process()
+
+# ✅ RSS is sampled at most once per TTL window and shared by all log records in between
+_MEM_TTL = 0.1  # seconds
+_mem_cache = [float("-inf"), "UNKNOWN"]  # [monotonic sample time, memory usage]
+
+
+def _reset_process_handle():
+    """Re-creates the cached process handle in a forked child (the PID has changed)."""
+    global _PROC
+    _PROC = psutil.Process()
+    _mem_cache[0] = float("-inf")
+
+
+if hasattr(os, "register_at_fork"):  # ✅ POSIX only; there is no fork on Windows
+    os.register_at_fork(after_in_child=_reset_process_handle)
+
 
 def should_sample_log():
     """
     Determines whether a log should be sampled based on the configured sampling rate.
 
+    Call n is kept when `floor((n + 1) * rate) > floor(n * rate)`, so exactly `rate` of the
+    calls are kept (evenly spread) for any rate, without the random generator's state update
+    on each call; `next()` on `itertools.count` is thread-safe.
+
     Returns:
         bool: True if the log should be recorded, False otherwise.
     """
-    return random.random() < LOG_SAMPLING_RATE
+    if LOG_SAMPLING_RATE <= 0:
+        return False
+    n = next(_sample_counter)
+    return int((n + 1) * LOG_SAMPLING_RATE) > int(n * LOG_SAMPLING_RATE)
 
 
 def get_memory_usage():
     """
-    Returns the current process's memory usage in MB.
+    Returns the current process's memory usage in MB, sampled at most every `_MEM_TTL` seconds.
 
     Returns:
         float: Memory usage in megabytes (rounded to 2 decimal places), or "UNKNOWN" if retrieval fails.
     """
-    try:
-        process = psutil.Process()
-        memory_usage_mb = process.memory_info().rss / (1024 * 1024)  # Convert bytes to MB
-        return round(memory_usage_mb, 2)
-    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-        return "UNKNOWN"  # ✅ Prevents logging failures due to permission or process errors
+    now = time.monotonic()
+    if now - _mem_cache[0] > _MEM_TTL:
+        try:
+            _mem_cache[1] = round(_PROC.memory_info().rss / 1048576, 2)  # Convert bytes to MB
+        except psutil.Error:
+            _mem_cache[1] = "UNKNOWN"  # ✅ Prevents logging failures due to permission or process errors
+        _mem_cache[0] = now
+    return _mem_cache[1]
 
 
 def track_execution_time(func):
@@ -51,9 +81,9 @@ def track_execution_time(func):
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        execution_time_ms = round((time.time() - start_time) * 1000, 2)  # Convert to ms
+        execution_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert ns to ms
 
         # ✅ Store execution time in logging metadata
         if "log_extra" in kwargs:
@@ -76,9 +106,11 @@ class ExecutionTimer:
         execution_time_ms (float): The execution time of the block in milliseconds.
     """
 
+    __slots__ = ("start_ns", "execution_time_ms")
+
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()  # ✅ Monotonic, unaffected by wall-clock changes
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.execution_time_ms = round((time.time() - self.start_time) * 1000, 2)  # Convert to ms
+        self.execution_time_ms = (time.perf_counter_ns() - self.start_ns) / 1_000_000  # Convert ns to ms